@@ -0,0 +1,14 @@
+#!/usr/bin/env bash
+# Start a long-lived filesystem MCP server shared by all research workers.
+#
+# The server speaks MCP streamable HTTP natively. Point the agent at it with:
+#   MCP_FILESYSTEM_URL=http://127.0.0.1:8765/mcp
+#
+# Usage: scripts/start_mcp.sh [root_dir]
+# Environment: MCP_HOST (default 127.0.0.1), MCP_PORT (default 8765)
+
+set -euo pipefail
+
+ROOT_DIR="${1:-$(cd "$(dirname "$0")/.." && pwd)}"
+
+exec python -m local_research.mcp_filesystem_server "${ROOT_DIR}"
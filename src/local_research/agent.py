@@ -13,11 +13,14 @@ input through final report delivery.
 
 from langgraph.graph import StateGraph, START, END
 
+from local_research.logging_config import configure_logging
 from local_research.state import AgentState, AgentInputState
 from local_research.research_scope import research_scope
 from local_research.research_supervisor import supervisor_agent
 from local_research.research_report import research_report
 
+configure_logging()
+
 # ===== ROUTING LOGIC =====
 
 def route_after_scoping(state: AgentState) -> str:
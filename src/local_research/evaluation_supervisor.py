@@ -7,11 +7,15 @@ except ImportError:
     pass
 
 from langchain_core.messages import HumanMessage, AIMessage, ToolMessage
+import itertools
 import os
-import uuid
+import time
 from langsmith import Client
 from local_research.research_supervisor import supervisor_agent
 
+# Number of evaluation rows run concurrently
+EVAL_MAX_CONCURRENCY = int(os.getenv("EVAL_MAX_CONCURRENCY", "16"))
+
 should_parallelize = [
     HumanMessage(content="Compare OpenAI vs Gemini deep research."),
     AIMessage(content="I need to analyze this request to determine if can should be parallelized.", tool_calls=[
@@ -69,10 +73,17 @@ def evaluate_parallelism(outputs: dict, reference_outputs:dict):
         "score": len(tool_calls) == reference_outputs["num_expected_threads"]
     }
 
-async def target_func(inputs: dict):
-    config = {"configurable": {"thread_id": uuid.uuid4()}}
-    return await supervisor_agent.nodes["supervisor"].ainvoke(inputs, config=config)
+# Thread IDs only need to be unique within this run, so use a process-scoped
+# prefix and a counter instead of generating a random UUID per row
+_thread_ids = itertools.count()
+_thread_id_prefix = f"{os.getpid()}-{int(time.time())}-"
 
+# Look up the compiled supervisor node once and share it across all rows
+supervisor_node = supervisor_agent.nodes["supervisor"]
+
+async def target_func(inputs: dict):
+    config = {"configurable": {"thread_id": f"{_thread_id_prefix}{next(_thread_ids)}"}}
+    return await supervisor_node.ainvoke(inputs, config=config)
 
 
 def main():
@@ -82,6 +93,7 @@ def main():
             data=dataset_name,
             evaluators=[evaluate_parallelism],
             experiment_prefix="Local_Research_Supervisor_Parallelism",
+            max_concurrency=EVAL_MAX_CONCURRENCY,
         )
     asyncio.run(run_agent())
 
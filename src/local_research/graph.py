@@ -4,10 +4,10 @@ try:
 except ImportError:
     pass
 
-from local_research.agent import agent
-
 def generate_agent_graph():
     """Generate PNG image of the agent workflow."""
+    # Imported here so importing this module does not build the full agent
+    from local_research.agent import agent
 
     agent_png = agent.get_graph(xray=True).draw_mermaid_png()
     with open("agent_graph.png", "wb") as f:
@@ -0,0 +1,21 @@
+"""Logging configuration for the local research package.
+
+Package modules log through ``logging.getLogger(__name__)``. The level defaults
+to WARNING and can be changed with the LOG_LEVEL environment variable, e.g.
+LOG_LEVEL=DEBUG to see MCP client and model fallback diagnostics.
+"""
+
+import logging
+import os
+
+
+def configure_logging() -> None:
+    """Set the package log level from LOG_LEVEL and attach a stderr handler if none exists."""
+    logger = logging.getLogger("local_research")
+    logger.setLevel(os.getenv("LOG_LEVEL", "WARNING").upper())
+
+    # Leave output to the application if it has configured logging itself
+    if not logger.handlers and not logging.getLogger().handlers:
+        handler = logging.StreamHandler()
+        handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s"))
+        logger.addHandler(handler)
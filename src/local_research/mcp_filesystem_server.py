@@ -0,0 +1,86 @@
+"""Long-lived filesystem MCP server over streamable HTTP.
+
+The default stdio configuration spawns a new @modelcontextprotocol/server-filesystem
+process for every tool call. This server is started once per host instead and
+shared by all research workers. Sessions are tracked natively by the MCP
+streamable HTTP transport, so concurrent tool calls from different sessions
+each receive their own responses.
+
+All paths are resolved against a single root directory and may not escape it.
+
+Usage:
+    python -m local_research.mcp_filesystem_server [root_dir]
+
+Environment variables:
+    MCP_HOST: Interface to bind (default 127.0.0.1)
+    MCP_PORT: Port to listen on (default 8765)
+"""
+
+import os
+import sys
+from pathlib import Path
+
+from mcp.server.fastmcp import FastMCP
+
+from local_research.utils import get_project_root
+
+mcp = FastMCP(
+    "filesystem",
+    host=os.getenv("MCP_HOST", "127.0.0.1"),
+    port=int(os.getenv("MCP_PORT", "8765")),
+)
+
+# Directory all tool paths are resolved against, set in main()
+root_dir = get_project_root().resolve()
+
+
+def resolve_path(path: str) -> Path:
+    """Resolve a tool path against the root directory, rejecting paths outside it."""
+    resolved = (root_dir / path).resolve()
+    if not resolved.is_relative_to(root_dir):
+        raise ValueError(f"Access denied - path outside allowed directory: {path}")
+    return resolved
+
+
+@mcp.tool()
+def write_file(path: str, content: str) -> str:
+    """Create a new file or overwrite an existing file with the given content."""
+    target = resolve_path(path)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    target.write_text(content, encoding="utf-8")
+    return f"Successfully wrote to {path}"
+
+
+@mcp.tool()
+def read_file(path: str) -> str:
+    """Read the complete contents of a text file."""
+    return resolve_path(path).read_text(encoding="utf-8")
+
+
+@mcp.tool()
+def list_directory(path: str = ".") -> str:
+    """List the files and directories in a directory."""
+    entries = sorted(resolve_path(path).iterdir())
+    return "\n".join(
+        f"[DIR] {entry.name}" if entry.is_dir() else f"[FILE] {entry.name}"
+        for entry in entries
+    )
+
+
+@mcp.tool()
+def create_directory(path: str) -> str:
+    """Create a directory, including any missing parent directories."""
+    resolve_path(path).mkdir(parents=True, exist_ok=True)
+    return f"Successfully created directory {path}"
+
+
+def main():
+    """Serve the filesystem tools over streamable HTTP."""
+    global root_dir
+    if len(sys.argv) > 1:
+        root_dir = Path(sys.argv[1]).resolve()
+    mcp.run(transport="streamable-http")
+
+
+if __name__ == "__main__":
+    main()
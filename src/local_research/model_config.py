@@ -16,14 +16,19 @@ Environment variables should be prefixed with the model purpose:
 - SUPERVISOR_MODEL=anthropic:claude-3-5-sonnet-20241022
 """
 
+import functools
+import logging
 import os
 from typing import Optional, Dict, Any
 from langchain.chat_models import init_chat_model
-from langchain_openai import ChatOpenAI
-from langchain_anthropic import ChatAnthropic
-from langchain_google_genai import ChatGoogleGenerativeAI
 
+log = logging.getLogger(__name__)
 
+# Provider SDKs are imported inside the branches that use them, so a run only
+# pays the import cost for providers it actually configures
+
+
+@functools.lru_cache(maxsize=64)
 def parse_model_string(model_string: str) -> tuple[str, str]:
     """Parse a model string into provider and model name.
 
@@ -53,6 +58,7 @@ def parse_model_string(model_string: str) -> tuple[str, str]:
         return parts[0], parts[1]
 
 
+@functools.lru_cache(maxsize=16)
 def create_local_chat_model(provider: str, model_info: str, **kwargs) -> Any:
     """Create a chat model for local providers (LM Studio, Ollama).
 
@@ -62,7 +68,9 @@ def create_local_chat_model(provider: str, model_info: str, **kwargs) -> Any:
         **kwargs: Additional arguments to pass to the model
 
     Returns:
-        Configured chat model instance
+        Configured chat model instance. Instances are cached per combination of
+        arguments, so callers share one HTTP client and its keep-alive connections.
+        Keyword argument values must therefore be hashable.
     """
     # Parse host, port, and model from model_info
     if "/" not in model_info:
@@ -86,6 +94,7 @@ def create_local_chat_model(provider: str, model_info: str, **kwargs) -> Any:
 
     if provider == "lmstudio":
         # LM Studio uses OpenAI-compatible API
+        from langchain_openai import ChatOpenAI
         return ChatOpenAI(
             base_url=f"http://{host}:{port}/v1",
             model=model_name,
@@ -103,6 +112,7 @@ def create_local_chat_model(provider: str, model_info: str, **kwargs) -> Any:
             )
         except ImportError:
             # Fallback to OpenAI-compatible API for Ollama
+            from langchain_openai import ChatOpenAI
             return ChatOpenAI(
                 base_url=f"http://{host}:{port}/v1",
                 model=model_name,
@@ -113,16 +123,48 @@ def create_local_chat_model(provider: str, model_info: str, **kwargs) -> Any:
         raise ValueError(f"Unsupported local provider: {provider}")
 
 
-def init_chat_model_from_env(env_var: str, fallback_model: str = "openai:gpt-4o", **kwargs) -> Any:
+# Anthropic beta header enabling cache_control markers on message content blocks
+ANTHROPIC_PROMPT_CACHE_HEADERS = {"anthropic-beta": "prompt-caching-2024-07-31"}
+
+
+def with_prompt_cache(provider: str, prompt_cache: bool, kwargs: Dict[str, Any]) -> Dict[str, Any]:
+    """Add provider-specific prompt caching options to model constructor kwargs.
+
+    OpenAI caches static prompt prefixes automatically and local servers reuse
+    their own KV cache, so only Anthropic needs explicit configuration.
+
+    Args:
+        provider: Provider name parsed from the model string
+        prompt_cache: Whether prompt caching should be enabled
+        kwargs: Constructor kwargs supplied by the caller
+
+    Returns:
+        Constructor kwargs with prompt caching options applied
+    """
+    if prompt_cache and provider == "anthropic":
+        return {"default_headers": ANTHROPIC_PROMPT_CACHE_HEADERS, **kwargs}
+    return kwargs
+
+
+def supports_prompt_cache(model: Any) -> bool:
+    """Check whether a chat model accepts Anthropic-style cache_control content blocks."""
+    return getattr(model, "_llm_type", None) == "anthropic-chat"
+
+
+@functools.cache
+def init_chat_model_from_env(env_var: str, fallback_model: str = "openai:gpt-4o", prompt_cache: bool = True, **kwargs) -> Any:
     """Initialize a chat model from environment variable with fallback.
 
     Args:
         env_var: Environment variable name (e.g., "REPORT_MODEL")
         fallback_model: Fallback model string if env var is not set
+        prompt_cache: Whether to enable provider-native prompt caching
         **kwargs: Additional arguments to pass to init_chat_model or model constructors
 
     Returns:
-        Configured chat model instance
+        Configured chat model instance. Instances are cached per combination of
+        arguments, so repeated calls share one client and its connection pool.
+        Keyword argument values must therefore be hashable.
 
     Examples:
         # Using environment variable
@@ -147,20 +189,20 @@ def init_chat_model_from_env(env_var: str, fallback_model: str = "openai:gpt-4o"
             return create_local_chat_model(provider, model_info, **kwargs)
 
         # Handle standard providers using langchain's init_chat_model
-        return init_chat_model(model=model_string, **kwargs)
+        return init_chat_model(model=model_string, **with_prompt_cache(provider, prompt_cache, kwargs))
 
     except Exception as e:
-        print(f"Error initializing model from {env_var}={model_string}: {e}")
-        print(f"Falling back to default model: {fallback_model}")
+        log.warning("Error initializing model from %s=%s: %s", env_var, model_string, e)
+        log.warning("Falling back to default model: %s", fallback_model)
 
         # Try fallback model
         try:
             provider, model_info = parse_model_string(fallback_model)
             if provider in ("lmstudio", "ollama"):
                 return create_local_chat_model(provider, model_info, **kwargs)
-            return init_chat_model(model=fallback_model, **kwargs)
+            return init_chat_model(model=fallback_model, **with_prompt_cache(provider, prompt_cache, kwargs))
         except Exception as fallback_error:
-            print(f"Error with fallback model {fallback_model}: {fallback_error}")
+            log.warning("Error with fallback model %s: %s", fallback_model, fallback_error)
             # Final fallback to a basic OpenAI model
             return init_chat_model(model="openai:gpt-4o", **kwargs)
 
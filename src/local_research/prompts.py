@@ -488,10 +488,9 @@ After each ConductResearch tool call, use think_tool to analyze the results:
 - Do NOT use acronyms or abbreviations in your research questions, be very clear and specific
 </Scaling Rules>"""
 
-final_report_generator_prompt = """Based on all the research conducted, create a comprehensive, well-structured answer to the overall research brief:
-<Research Brief>
-{research_brief}
-</Research Brief>
+# Static instructions for the final report. Contains no format slots, so the
+# exact same text starts every report prompt and providers can cache it.
+final_report_generator_prompt = """Based on all the research conducted, create a comprehensive, well-structured answer to the overall research brief given after these instructions.
 
 <Available Tools>
 You have access to one tool:
@@ -505,13 +504,6 @@ CRITICAL: Make sure the answer is written in the same language as the human mess
 For example, if the user's messages are in English, then MAKE SURE you write your response in English. If the user's messages are in Chinese, then MAKE SURE you write your entire response in Chinese.
 This is critical. The user will only understand the answer if it is written in the same language as their input message.
 
-Today's date is {date}.
-
-Here are the findings from the research that you conducted:
-<Findings>
-{findings}
-</Findings>
-
 Please create a detailed answer to the overall research brief that:
 1. Is well-organized with proper headings (# for title, ## for sections, ### for subsections)
 2. Includes specific facts and insights from the research
@@ -573,3 +565,19 @@ Format the report in clear markdown with proper structure and include source ref
 - Citations are extremely important. Make sure to include these, and pay a lot of attention to getting these right. Users will often use these citations to look into more information.
 </Citation Rules>
 """
+
+# Dynamic part of the final report prompt, appended after the static
+# final_report_generator_prompt.
+final_report_findings_prompt = """<Research Brief>
+{research_brief}
+</Research Brief>
+
+Today's date is {date}.
+
+Here are the findings from the research that you conducted:
+<Findings>
+{findings}
+</Findings>
+
+Write the final report following the instructions above.
+"""
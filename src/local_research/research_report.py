@@ -1,29 +1,122 @@
+import asyncio
+import functools
+import hashlib
+import logging
+import os
+import weakref
+
+from langchain_core.callbacks import AsyncCallbackHandler
 from langchain_core.messages import HumanMessage, ToolMessage
+from langchain_core.runnables import RunnableConfig
+from langchain_core.runnables.config import merge_configs
+from langgraph.config import get_stream_writer
 from langgraph.graph import StateGraph, START, END
 from langchain_mcp_adapters.client import MultiServerMCPClient
 
+from local_research.model_config import get_report_model, supports_prompt_cache
 from local_research.utils import get_today_str, get_project_root
-from local_research.prompts import final_report_generator_prompt
-from local_research.state import AgentState
-from langgraph.types import Command
+from local_research.prompts import final_report_generator_prompt, final_report_findings_prompt
+from local_research.state import AgentState, ReportToolCallState
+from langgraph.types import Command, Send
 from typing_extensions import Literal
 
+log = logging.getLogger(__name__)
+
 # ===== Config =====
 
-from local_research.model_config import get_report_model
-writer_model = get_report_model(max_tokens=32000)
-
-mcp_config = {
-    "filesystem": {
-        "command": "npx",
-        "args": [
-            "-y",  # Auto-install if needed
-            "@modelcontextprotocol/server-filesystem",
-            str(get_project_root())
-        ],
-        "transport": "stdio"  # Communication via stdin/stdout
+@functools.cache
+def get_report_cache():
+    """Build the response cache for the writer model from the RESEARCH_CACHE env var.
+
+    The cache is built once and shared by the writer models for every output
+    budget.
+
+    Cache keys combine the full prompt with the model parameters and bound tool
+    schemas, so editing the report prompt or the MCP tools invalidates entries.
+
+    Modes:
+        exact (default): SQLite cache keyed on the exact prompt
+        semantic: Redis cache matching near-identical prompts by embedding
+        off: no caching
+    """
+    mode = os.getenv("RESEARCH_CACHE", "exact").lower()
+
+    if mode == "off":
+        return None
+    if mode == "semantic":
+        from langchain_community.cache import RedisSemanticCache
+        from langchain_openai import OpenAIEmbeddings
+        return RedisSemanticCache(
+            redis_url=os.getenv("REDIS_URL", "redis://localhost:6379"),
+            embedding=OpenAIEmbeddings(),
+            score_threshold=0.03,  # Vector distance, i.e. >= 0.97 cosine similarity
+        )
+
+    from langchain_community.cache import SQLiteCache
+    return SQLiteCache(database_path=str(get_project_root() / ".lc_cache.db"))
+
+# Output token budgets the writer model is created with. Each report gets the
+# smallest bucket that fits its findings, so short briefs do not reserve a full
+# 32k generation slot on the serving backend.
+REPORT_TOKEN_BUCKETS = (2048, 4096, 8192, 16384, 32000)
+
+def get_report_token_budget(findings_chars: int) -> int:
+    """Pick the output token budget bucket for a report from the size of its findings in characters."""
+    estimate = findings_chars // 2
+    return next(
+        (bucket for bucket in REPORT_TOKEN_BUCKETS if bucket >= estimate),
+        REPORT_TOKEN_BUCKETS[-1]
+    )
+
+@functools.cache
+def get_writer_model(max_tokens: int = 32000):
+    """Get the report writer model for an output budget, creating it on first use."""
+    return get_report_model(max_tokens=max_tokens, cache=get_report_cache())
+
+# URL of a shared, long-lived filesystem MCP server (see scripts/start_mcp.sh).
+# When unset, each tool call spawns its own server subprocess over stdio.
+MCP_FILESYSTEM_URL = os.getenv("MCP_FILESYSTEM_URL")
+
+if MCP_FILESYSTEM_URL:
+    mcp_config = {
+        "filesystem": {
+            "url": MCP_FILESYSTEM_URL,
+            "transport": "streamable_http"  # Sessions are tracked by the server, so concurrent calls stay separate
+        }
+    }
+else:
+    mcp_config = {
+        "filesystem": {
+            "command": "npx",
+            "args": [
+                "-y",  # Auto-install if needed
+                "@modelcontextprotocol/server-filesystem",
+                str(get_project_root())
+            ],
+            "transport": "stdio"  # Communication via stdin/stdout
+        }
     }
-}
+
+# Maximum number of MCP tool calls in flight at once. Every tool call opens its
+# own MCP session, which over stdio means spawning a new filesystem server
+# (Node) process, so this also caps the processes a single report can start.
+MCP_MAX_CONC = int(os.getenv("MCP_MAX_CONC", "4"))
+_mcp_semaphores = weakref.WeakKeyDictionary()
+
+def _get_mcp_semaphore():
+    """Get the MCP tool call semaphore for the running event loop.
+
+    asyncio primitives are bound to the loop that first waits on them, so each
+    loop (e.g. each asyncio.run() in the eval scripts) gets its own semaphore.
+    """
+    loop = asyncio.get_running_loop()
+    semaphore = _mcp_semaphores.get(loop)
+    if semaphore is None:
+        semaphore = _mcp_semaphores[loop] = asyncio.Semaphore(MCP_MAX_CONC)
+    return semaphore
+
+# Seconds a single MCP tool call may run before it is cancelled
+MCP_TOOL_TIMEOUT = float(os.getenv("MCP_TOOL_TIMEOUT", "60"))
 
 # Global client variable - will be initialized lazily
 _client = None
@@ -32,104 +125,265 @@ def get_mcp_client():
     """Get or initialize MCP client lazily to avoid issues with LangGraph Platform."""
     global _client
     if _client is None:
-        print("Creating new MCP client...")
+        log.debug("Creating new MCP client")
         _client = MultiServerMCPClient(mcp_config)
-    else:
-        print("Reusing existing MCP client...")
     return _client
 
-async def final_report_generation(state: AgentState) -> Command[Literal["final_report_tools"]]:
+# Tool schemas are static for the life of the MCP server, so fetch them once
+_tools_cache = None
+_tools_by_name = None
+_tools_locks = weakref.WeakKeyDictionary()
+
+def _get_tools_lock():
+    """Get the lock guarding the first tool fetch for the running event loop."""
+    loop = asyncio.get_running_loop()
+    lock = _tools_locks.get(loop)
+    if lock is None:
+        lock = _tools_locks[loop] = asyncio.Lock()
+    return lock
+
+async def get_mcp_tools():
+    """Get MCP tools and a name lookup for them, fetching from the server only on first use.
+
+    Returns:
+        Tuple of (tools, tools_by_name)
     """
-    Final report generation node.
+    global _tools_cache, _tools_by_name
+    async with _get_tools_lock():
+        if _tools_cache is None:
+            _tools_cache = await get_mcp_client().get_tools()
+            _tools_by_name = {tool.name: tool for tool in _tools_cache}
+    return _tools_cache, _tools_by_name
+
+@functools.lru_cache(maxsize=16)
+def get_bound_writer(max_tokens: int):
+    """Get the writer model with the MCP tools bound.
+
+    bind_tools converts every tool schema to the provider's format. The tools
+    are fetched once per process, so the binding only varies with the output
+    budget. Call get_mcp_tools() first so the tools are loaded.
+    """
+    return get_writer_model(max_tokens).bind_tools(_tools_cache)
+
+# At most REPORT_MAX_CONC report generations are in flight to the provider at
+# once, to stay within rate limits when several runs share a worker
+REPORT_MAX_CONC = int(os.getenv("REPORT_MAX_CONC", "4"))
+_report_semaphores = weakref.WeakKeyDictionary()
+
+def _get_report_semaphore():
+    """Get the report generation semaphore for the running event loop."""
+    loop = asyncio.get_running_loop()
+    semaphore = _report_semaphores.get(loop)
+    if semaphore is None:
+        semaphore = _report_semaphores[loop] = asyncio.Semaphore(REPORT_MAX_CONC)
+    return semaphore
+
+# Notes longer than this are truncated before report generation (0 = no limit)
+MAX_NOTE_CHARS = int(os.getenv("MAX_NOTE_CHARS", "0"))
+
+# Also drop near-duplicate notes (requires the optional datasketch package)
+NOTES_NEAR_DEDUP = os.getenv("NOTES_NEAR_DEDUP", "false").lower() == "true"
+
+def drop_near_duplicate_notes(notes: list[str], threshold: float = 0.85) -> list[str]:
+    """Drop notes whose words overlap an earlier note by estimated Jaccard >= threshold.
+
+    Logs a warning and returns the notes unchanged if datasketch is not installed.
+    """
+    try:
+        from datasketch import MinHash, MinHashLSH
+    except ImportError:
+        log.warning(
+            "NOTES_NEAR_DEDUP is enabled but datasketch is not installed; "
+            "skipping near-duplicate removal (pip install 'local_research[dedup]')"
+        )
+        return notes
+
+    lsh = MinHashLSH(threshold=threshold, num_perm=128)
+    minhashes = {}
+    kept = []
+    for index, note in enumerate(notes):
+        minhash = MinHash(num_perm=128)
+        for word in set(note.split()):
+            minhash.update(word.encode())
+        # LSH only returns approximate candidates, so check each one's estimated Jaccard
+        if any(minhash.jaccard(minhashes[key]) >= threshold for key in lsh.query(minhash)):
+            continue
+        key = str(index)
+        lsh.insert(key, minhash)
+        minhashes[key] = minhash
+        kept.append(note)
+    return kept
 
-    Synthesizes all research findings into a comprehensive final report
+def prepare_notes(notes: list[str]) -> list[str]:
+    """Deduplicate and bound research notes before they go into the report prompt.
+
+    Sub-agents often return overlapping evidence, so repeated notes are dropped
+    by content hash, keeping the first occurrence to preserve ordering.
     """
+    seen = set()
+    unique_notes = []
+    for note in notes:
+        digest = hashlib.blake2b(note.encode(), digest_size=16).digest()
+        if digest in seen:
+            continue
+        seen.add(digest)
+        unique_notes.append(note)
+
+    if NOTES_NEAR_DEDUP:
+        unique_notes = drop_near_duplicate_notes(unique_notes)
+
+    if MAX_NOTE_CHARS:
+        unique_notes = [note[:MAX_NOTE_CHARS] for note in unique_notes]
+
+    return unique_notes
+
+class ReportStreamHandler(AsyncCallbackHandler):
+    """Forward report tokens to the LangGraph custom stream as they are generated."""
+
+    def __init__(self, writer):
+        """Initialize the handler with the LangGraph stream writer of the current run."""
+        self.writer = writer
+        # Whether any chunk was emitted; stays False on a response cache hit
+        self.emitted = False
+
+    async def on_llm_new_token(self, token, *, chunk=None, **kwargs):
+        """Emit each generated chunk as a final_report_chunk event."""
+        text = chunk.text if chunk is not None else token
+        if text:
+            self.writer({"final_report_chunk": text})
+            self.emitted = True
 
-    notes = state.get("notes", [])
+def build_final_report_message(research_brief: str, notes: list[str], cache_prefix: bool) -> HumanMessage:
+    """Build the final report prompt message from the research brief and notes.
 
-    findings = "\n".join(notes)
+    The static instructions come first, unformatted, so providers can cache
+    them as a prompt prefix across all reports; only the brief, findings and
+    date are formatted per call. The joined findings and formatted suffix are
+    local to this function, so only the finished message stays in memory
+    while the report is generated.
 
-    final_report_prompt = final_report_generator_prompt.format(
-        research_brief=state.get("research_brief", ""),
-        findings=findings,
+    Args:
+        research_brief: Research brief to answer
+        notes: Research notes making up the findings
+        cache_prefix: Whether to mark the static prefix with Anthropic cache_control
+
+    Returns:
+        HumanMessage containing the full report prompt
+    """
+    dynamic_suffix = final_report_findings_prompt.format(
+        research_brief=research_brief,
+        findings="\n".join(notes),
         date=get_today_str()
     )
 
-    # Get available tools from MCP server
-    client = get_mcp_client()
-    tools = await client.get_tools() # should cache the tools
+    if cache_prefix:
+        return HumanMessage(content=[
+            {"type": "text", "text": final_report_generator_prompt, "cache_control": {"type": "ephemeral"}},
+            {"type": "text", "text": dynamic_suffix},
+        ])
+    # Single join so no intermediate concatenation is allocated
+    return HumanMessage(content="\n".join((final_report_generator_prompt, dynamic_suffix)))
 
-    # Initialize model with tool binding
-    model_with_tools = writer_model.bind_tools(tools)
+async def final_report_generation(state: AgentState, config: RunnableConfig) -> Command[Literal["exec_tool", "__end__"]]:
+    """
+    Final report generation node.
 
-    final_report = await model_with_tools.ainvoke([HumanMessage(content=final_report_prompt)])
+    Synthesizes all research findings into a comprehensive final report.
+    The report is streamed from the model and forwarded chunk by chunk as
+    "custom" stream events, so clients can render it while it is written.
+    """
+
+    notes = prepare_notes(state.get("notes", []))
+
+    # Size of the newline-joined findings, computed without building them here
+    findings_chars = sum(len(note) for note in notes) + len(notes)
+    max_tokens = get_report_token_budget(findings_chars)
+    writer_model = get_writer_model(max_tokens)
+
+    final_report_message = build_final_report_message(
+        state.get("research_brief", ""),
+        notes,
+        cache_prefix=supports_prompt_cache(writer_model)
+    )
+
+    # Get available tools from MCP server and the model with them bound
+    await get_mcp_tools()
+    model_with_tools = get_bound_writer(max_tokens)
+
+    # stream=True makes ainvoke generate through the provider's streaming API
+    # while still going through the response cache; the handler forwards
+    # generated tokens to this run's stream
+    stream_handler = ReportStreamHandler(get_stream_writer())
+    async with _get_report_semaphore():
+        final_report = await model_with_tools.ainvoke(
+            [final_report_message],
+            config=merge_configs(config, {"callbacks": [stream_handler]}),
+            stream=True,
+        )
+
+    # Cached responses are returned without generating, so emit them in one piece
+    if not stream_handler.emitted and final_report.content:
+        stream_handler.writer({"final_report_chunk": final_report.content})
+
+    # Fan tool calls out to parallel exec_tool invocations directly from this
+    # node, or end the workflow when the writer made no tool calls
+    if final_report.tool_calls:
+        goto = [Send("exec_tool", {"tool_call": tool_call}) for tool_call in final_report.tool_calls]
+    else:
+        goto = END
 
     return Command(
-        goto="final_report_tools",
+        goto=goto,
         update={
-            "final_report": final_report,
+            "final_report": final_report.content,
             "messages": ["Here is the final report: " + final_report.content],
         }
     )
 
-async def final_report_tools(state: AgentState) -> Command[Literal["__end__"]]:
-    """Execute tool calls using MCP tools.
+async def exec_tool(state: ReportToolCallState):
+    """Execute a single tool call using MCP tools.
 
-    This node:
-    1. Retrieves current tool calls from the final_report AI message
-    2. Executes all tool calls using async operations (required for MCP)
-    3. Returns formatted tool results
+    Runs as one branch of the final_report_generation fan-out. Each call opens
+    its own MCP session (a new server process over stdio), so concurrent
+    branches are bounded by MCP_MAX_CONC. Each result is merged into messages
+    by the add_messages reducer. A call running longer than MCP_TOOL_TIMEOUT is
+    cancelled so one stuck tool cannot hold up the rest of the fan-out.
 
     Note: MCP requires async operations due to inter-process communication
-    with the MCP server subprocess. This is unavoidable.
+    with the MCP server. This is unavoidable.
     """
-    # Get tool calls from the final_report AI message, not from messages list
-    final_report = state.get("final_report")
-    if not hasattr(final_report, 'tool_calls') or not final_report.tool_calls:
-        return Command(
-            goto=END,
-            update={
-
-            }
-        )
-
-    tool_calls = final_report.tool_calls
+    tool_call = state["tool_call"]
 
-    async def execute_tools():
-        """Execute all tool calls. MCP tools require async execution."""
-        # Get fresh tool references from MCP server
-        client = get_mcp_client()
-        tools = await client.get_tools()
-        tools_by_name = {tool.name: tool for tool in tools}
+    # Get cached tool references from MCP server
+    _, tools_by_name = await get_mcp_tools()
+    tool = tools_by_name[tool_call["name"]]
 
-        # Execute tool calls (sequentially for reliability)
-        observations = []
-        for tool_call in tool_calls:
-            tool = tools_by_name[tool_call["name"]]
-            observation = await tool.ainvoke(tool_call["args"])
-            observations.append(observation)
+    async with _get_mcp_semaphore():
+        try:
+            async with asyncio.timeout(MCP_TOOL_TIMEOUT) as deadline:
+                observation = await tool.ainvoke(tool_call["args"])
+            status = "success"
+        except Exception as e:
+            # Cancelling the session while the stdio server starts or stops
+            # surfaces as an ExceptionGroup rather than TimeoutError, so check
+            # the deadline itself
+            if deadline.expired():
+                observation = f"Error: {tool_call['name']} timed out after {MCP_TOOL_TIMEOUT:g}s"
+            else:
+                # Surface failures as error results instead of failing the whole fan-out
+                observation = f"Error: {e}"
+            status = "error"
 
-        # Format results as tool messages
-        tool_outputs = [
+    return {
+        "messages": [
             ToolMessage(
                 content=observation,
                 name=tool_call["name"],
                 tool_call_id=tool_call["id"],
+                status=status,
             )
-            for observation, tool_call in zip(observations, tool_calls)
         ]
-
-        return tool_outputs
-
-    tool_messages = await execute_tools()
-
-    return Command(
-        goto=END,
-        update={
-            "final_report": final_report.content,
-            "messages": tool_messages
-        }
-    )
+    }
 
 # ===== GRAPH CONSTRUCTION =====
 
@@ -138,11 +392,11 @@ final_report_builder = StateGraph(AgentState)
 
 # Add nodes to the graph
 final_report_builder.add_node("final_report_generation", final_report_generation)
-final_report_builder.add_node("final_report_tools", final_report_tools)
+final_report_builder.add_node("exec_tool", exec_tool)
 
 # Add edges to connect nodes
 final_report_builder.add_edge(START, "final_report_generation")
-final_report_builder.add_edge("final_report_tools", END)
+final_report_builder.add_edge("exec_tool", END)
 
 # Compile the agent
 research_report = final_report_builder.compile()
@@ -32,6 +32,17 @@ class AgentState(MessagesState):
     # Final formatted research report
     final_report: str
 
+# ===== REPORT =====
+
+class ReportToolCallState(TypedDict):
+    """
+    State sent to each parallel report tool execution.
+
+    Carries a single tool call from the report writer so that every call
+    can run as its own node invocation.
+    """
+    tool_call: dict
+
 # ===== SUPERVISOR =====
 
 class SupervisorState(TypedDict):